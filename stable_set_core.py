@@ -0,0 +1,195 @@
+"""Voting computations and drawings behind the Stable Set Explorer app."""
+import io
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Rust-backed Excel reader; pandas falls back to openpyxl/xlrd without it.
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
+# Largest distinct-ballots x M x M broadcast the pairwise tally may build
+# (tensordot promotes it to int64, so 8 bytes per element). Bigger profiles
+# run in the compiled kernel when Numba is installed, otherwise one
+# candidate row at a time with a distinct-ballots x M temporary.
+BROADCAST_ELEMENT_BUDGET = 2_000_000
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def majority_numba(ranks_by_candidate, counts, n_voters):
+        n, n_ballots = ranks_by_candidate.shape
+        majority = np.zeros((n, n), np.bool_)
+        # each thread owns whole rows of the result, so nothing is shared
+        for i in prange(n):
+            ri = ranks_by_candidate[i]
+            for j in range(n):
+                rj = ranks_by_candidate[j]
+                wins = 0
+                remaining = n_voters
+                # stop as soon as the pair is decided either way
+                for v in range(n_ballots):
+                    remaining -= counts[v]
+                    if ri[v] < rj[v]:
+                        wins += counts[v]
+                        if 2 * wins > n_voters:
+                            majority[i, j] = True
+                            break
+                    elif 2 * (wins + remaining) <= n_voters:
+                        break
+        return majority
+
+# ------------------------ Voting Functions ------------------------
+def load_profile(raw_bytes, filename, has_header):
+    header = 0 if has_header else None
+    if filename.endswith(".csv"):
+        df = pd.read_csv(io.BytesIO(raw_bytes), header=header)
+    else:
+        df = pd.read_excel(io.BytesIO(raw_bytes), header=header, engine=EXCEL_ENGINE)
+    df.columns = [f"Voter {i+1}" for i in range(df.shape[1])]
+    table = df.to_numpy()
+    # codes[p, v]: index in candidates of voter v's p-th cell, -1 for blanks
+    codes, labels = pd.factorize(table.ravel())
+    return df, list(labels), codes.reshape(table.shape).astype(np.int32)
+
+def rank_matrix(codes, candidates):
+    n_voters, n_candidates = codes.shape[1], len(candidates)
+    ranked = codes >= 0
+    voter = np.broadcast_to(np.arange(n_voters), codes.shape)
+    # ranks[v, i] = position of candidate i in voter v's ballot (unranked = last)
+    ranks = np.full((n_voters, n_candidates), n_candidates, dtype=np.int16)
+    ranks[voter[ranked], codes[ranked]] = (ranked.cumsum(axis=0) - 1)[ranked]
+    return ranks
+
+# A[i, j] is True when candidate i beats candidate j by majority
+def compute_majority_matrix(ranks):
+    n_voters = len(ranks)
+    # identical ballots are tallied once, weighted by how many voters cast them
+    ballots, counts = np.unique(ranks, axis=0, return_counts=True)
+    n = ranks.shape[1]
+    large = len(ballots) * n * n > BROADCAST_ELEMENT_BUDGET
+    if large and njit is not None:
+        # most common ballots first, so most pairs are decided early
+        order = np.argsort(-counts, kind="stable")
+        return majority_numba(np.ascontiguousarray(ballots[order].T), counts[order], n_voters)
+    if large:
+        wins = np.empty((n, n), np.int64)
+        for i in range(n):
+            wins[i] = counts @ (ballots[:, [i]] < ballots)
+    else:
+        wins = np.tensordot(counts, ballots[:, :, None] < ballots[:, None, :], axes=1)
+    # strict majority, kept in integers: wins > n_voters / 2
+    return 2 * wins > n_voters
+
+def majority_edges(A, candidates):
+    return tuple((candidates[i], candidates[j]) for i, j in np.argwhere(A))
+
+def members(mask, candidates):
+    return {candidates[i] for i in np.flatnonzero(mask)}
+
+# --- Νέος ορισμός συνάρτησης m_stable ---
+def m_stable(A, candidates):
+    """
+    Υπολογίζει το m-stable set του γράφου με πίνακα κυριαρχίας A.
+    Ένας κόμβος είναι m-stable αν δεν ηττάται από καμία συμμαχία
+    που αποτελείται από κόμβους που δεν ηττώνται από αυτόν.
+    """
+    # some coalition of them defeats x iff one member y alone does:
+    # y beats x while x does not beat y
+    dominated = (A.T & ~A).any(axis=1)
+    return members(~dominated, candidates)
+
+def stable_sets(A, candidates):
+    # shared by all definitions: is x beaten by / does x beat some alternative
+    beaten = A.any(axis=0)
+    beats = A.any(axis=1)
+    not_beating = len(candidates) - A.sum(axis=0)
+    # beaten by nobody; a coalition defeating x exists iff one alternative does
+    undefeated = members(~beaten, candidates)
+    return {
+        "Van Deemen Stable Set": undefeated,
+        # every z != x must leave some y != z that does not beat x: true when
+        # x has two such y, or one and it is x itself (nobody beats themselves)
+        "Extended Stable Set": members((not_beating >= 2) | ((not_beating == 1) & ~A.diagonal()), candidates),
+        "W-Stable Set": undefeated,
+        "Duggan Set": members(~beaten & beats, candidates),
+        "Generalized Stable Set": undefeated,
+        "M-Stable Set": m_stable(A, candidates),  # Νέο σύνολο
+    }
+
+def condorcet_winner(A, candidates):
+    winners = np.flatnonzero(A.sum(axis=1) == len(candidates) - 1)
+    return candidates[winners[0]] if winners.size else None
+
+def borda_count(ranks, candidates):
+    n = len(candidates)
+    # n - 1 points for first place down to 0 for last; unranked candidates get 0
+    scores = np.where(ranks < n, n - 1 - ranks, 0).sum(axis=0)
+    borda_df = pd.DataFrame({"Candidate": candidates, "Borda Score": scores})
+    return borda_df.sort_values("Borda Score", ascending=False, kind="stable").reset_index(drop=True)
+
+def analyze(codes, candidates):
+    ranks = rank_matrix(codes, candidates)
+    A = compute_majority_matrix(ranks)
+    return A, stable_sets(A, candidates), condorcet_winner(A, candidates), borda_count(ranks, candidates)
+
+# ------------------------ Drawing Functions ------------------------
+def build_graph(nodes, edges):
+    G = nx.DiGraph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from(edges)
+    return G
+
+def figure_png(fig):
+    # same rendering options st.pyplot uses, then free the figure
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
+
+def graph_layout(nodes, edges):
+    return nx.spring_layout(build_graph(nodes, edges), seed=42)
+
+def draw_dominance_graph(A, candidates):
+    nodes, edges = tuple(candidates), majority_edges(A, candidates)
+    G = build_graph(nodes, edges)
+    pos = graph_layout(nodes, edges)
+    fig, ax = plt.subplots()
+    nx.draw(G, pos, with_labels=True, node_color="skyblue", node_size=2000,
+            font_size=14, font_weight='bold', arrows=True, ax=ax)
+    return figure_png(fig)
+
+def hasse_matrix(A):
+    # transitive closure (Warshall, one vectorized row update per pivot)
+    closure = A.copy()
+    for k in range(len(A)):
+        closure |= closure[:, [k]] & closure[k]
+    if closure.diagonal().any():
+        return None
+    # u -> v is implied when v is reachable from a successor of u
+    longer = (A.astype(np.int32) @ closure.astype(np.int32)) > 0
+    return A & ~longer
+
+def draw_hasse_diagram(A, candidates):
+    reduced = hasse_matrix(A)
+    if reduced is None:
+        return None
+    nodes, edges = tuple(candidates), majority_edges(reduced, candidates)
+    H = build_graph(nodes, edges)
+    pos = graph_layout(nodes, edges)
+    fig, ax = plt.subplots()
+    nx.draw(H, pos, with_labels=True, node_color="lightgreen", node_size=2000,
+            font_size=14, font_weight='bold', arrows=True, ax=ax)
+    ax.set_title("Hasse Diagram (Transitive Reduction)", fontsize=14)
+    return figure_png(fig)